@@ -1,18 +1,24 @@
+import asyncio
 import feedparser
 import logging
-import openai
 import os
 import hashlib
 import sqlite3
 import re
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 import csv
+import html
 import schedule
-import time
+import threading
 from dotenv import load_dotenv
+from openai import AsyncOpenAI
 import telebot
+from telebot import apihelper
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+from lxml import etree
 
 # Загрузка переменных окружения
 load_dotenv()
@@ -22,6 +28,28 @@ TELEGRAM_THREAD_ID = os.getenv("TELEGRAM_THREAD_ID")  # Если нужно от
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 RSS_URL = "https://rss.sciencedirect.com/publication/science/03603199"
 DB_FILE = "ijohe_db.sqlite"
+# Контейнеры аннотации на ScienceDirect, в порядке приоритета
+ABSTRACT_SELECTORS = ("div.Abstracts", "div.svAbstract", "div.abstract.author")
+# Строки с датой публикации и авторами в теге <description> RSS-ленты
+_PUBDATE_RE = re.compile(r'Publication date:\s*([^<\n]+)', re.I)
+_AUTHORS_RE = re.compile(r'Author\(s\):\s*([^<\n]+)', re.I)
+# Ошибки Telegram (400), вызванные самим текстом статьи: повтор публикации не поможет
+_TG_PERMANENT_ERRORS = ("can't parse entities", "message is too long")
+# Парсер RSS: без подстановки внешних сущностей и сетевых запросов
+_RSS_PARSER = etree.XMLParser(resolve_entities=False, no_network=True)
+# Повторяющиеся пробелы в аннотации
+_WS_RE = re.compile(r'\s+')
+# Теги <sub>/<sup>, которые Telegram не поддерживает
+_TG_STRIP = re.compile(r'</?su[bp]>')
+
+# Заголовки запросов к страницам ScienceDirect
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.sciencedirect.com/"
+}
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,45 +58,127 @@ logger = logging.getLogger(__name__)
 # Инициализация бота
 bot = telebot.TeleBot(TELEGRAM_BOT_TOKEN)
 
+# Одна HTTP-сессия для всех запросов к api.telegram.org (keep-alive, без повторного TLS-рукопожатия)
+_tg_session = requests.Session()
+_tg_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+apihelper.session = _tg_session
+
 # Настройка OpenAI API
-openai.api_key = OPENAI_API_KEY
+aclient = AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+# Общий HTTP-клиент: соединения с ScienceDirect переиспользуются между запросами
+_http = httpx.AsyncClient(
+    http2=True,
+    headers=HEADERS,
+    timeout=10,
+    follow_redirects=True,
+    limits=httpx.Limits(max_keepalive_connections=10)
+)
+
+# Единое соединение с БД на весь процесс (autocommit, WAL)
+_CONN = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None, cached_statements=256)
+_DB_LOCK = threading.Lock()
+
+# Запросы вынесены в константы: одна и та же строка попадает в кэш
+# подготовленных выражений соединения
+_SQL_INSERT = "INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_EXISTS = "SELECT EXISTS(SELECT 1 FROM articles WHERE hash=? LIMIT 1)"
+_SQL_TRANSLATION_GET = "SELECT output FROM translations WHERE prompt_hash=?"
+_SQL_TRANSLATION_PUT = "INSERT OR IGNORE INTO translations VALUES (?, ?, ?)"
+
+def _init_db():
+    """
+    Настраивает соединение и создаёт таблицы. Вызывается один раз при старте.
+    """
+    _CONN.execute("PRAGMA journal_mode=WAL")
+    _CONN.execute("PRAGMA synchronous=NORMAL")
+    _CONN.execute("PRAGMA temp_store=MEMORY")
+    _CONN.execute("""
+        CREATE TABLE IF NOT EXISTS articles (
+            hash TEXT PRIMARY KEY,
+            title_ru TEXT,
+            annotation_ru TEXT,
+            authors TEXT,
+            published_date TEXT,
+            url TEXT
+        )
+    """)
+    _CONN.execute("""
+        CREATE TABLE IF NOT EXISTS translations (
+            prompt_hash TEXT PRIMARY KEY,
+            model TEXT,
+            output TEXT
+        )
+    """)
+
+_init_db()
 
-def parse_rss():
+# Хэши уже известных статей: один проход по таблице при старте
+# вместо запроса к БД на каждую проверку
+_seen_hashes = {row[0] for row in _CONN.execute("SELECT hash FROM articles")}
+
+def parse_rss_items(content):
+    """
+    Разбирает RSS-ленту как XML через lxml.
+    Возвращает список словарей с полями title, link, description (если они есть в <item>).
+    """
+    root = etree.fromstring(content, _RSS_PARSER)
+    entries = []
+    for item in root.iterfind('.//{*}item'):
+        entry = {}
+        for field in ('title', 'link', 'description'):
+            value = item.findtext('{*}' + field)
+            if value is not None:
+                entry[field] = value.strip()
+        entries.append(entry)
+    return entries
+
+async def parse_rss():
     """
     Парсит RSS-ленту ScienceDirect.
+    Лента разбирается через lxml; feedparser используется, только если XML некорректен.
     Из тега <description> извлекаются дата публикации (из строки с "Publication date:")
     и автор(ы) (из строки с "Author(s):").
     """
     logger.info(f"Загружаем RSS-ленту: {RSS_URL}")
-    feed = feedparser.parse(RSS_URL)
-
-    if feed.bozo:
-        logger.error("Ошибка при парсинге RSS-ленты.")
+    try:
+        response = await _http.get(RSS_URL)
+        response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Ошибка при загрузке RSS-ленты: {e}")
         return []
 
-    if not feed.entries:
+    try:
+        entries = parse_rss_items(response.content)
+    except etree.XMLSyntaxError as e:
+        logger.warning(f"RSS-лента не разобрана как XML ({e}), пробуем feedparser.")
+        feed = feedparser.parse(response.content)
+        # bozo здесь выставлен почти всегда (XML уже признан некорректным),
+        # но feedparser обычно всё равно восстанавливает записи
+        if feed.bozo:
+            logger.warning(f"feedparser: лента разобрана с ошибками ({feed.get('bozo_exception')}).")
+        entries = feed.entries
+
+    if not entries:
         logger.warning("Нет статей в RSS-ленте.")
         return []
 
     articles = []
     # Для теста берем 5 статей. Уберите [:5], если нужно обрабатывать все.
-    for entry in feed.entries[:5]:
+    for entry in entries[:5]:
         title = entry.get('title', 'Без названия')
         link = entry.get('link', '#')
         description_html = entry.get('description', '')
-        soup = BeautifulSoup(description_html, 'html.parser')
-        p_tags = soup.find_all('p')
 
         publication_date = "Неизвестно"
         authors = "Неизвестны"
 
-        for p in p_tags:
-            text = p.get_text().strip()
-            lower_text = text.lower()
-            if lower_text.startswith("publication date:"):
-                publication_date = text.split(":", 1)[1].strip()
-            elif lower_text.startswith("author(s):"):
-                authors = text.split(":", 1)[1].strip()
+        match = _PUBDATE_RE.search(description_html)
+        if match:
+            publication_date = html.unescape(match.group(1)).strip()
+        match = _AUTHORS_RE.search(description_html)
+        if match:
+            authors = html.unescape(match.group(1)).strip()
 
         articles.append({
             'title': title,
@@ -82,20 +192,13 @@ def parse_rss():
     logger.info(f"Получено {len(articles)} статей из RSS-ленты.")
     return articles
 
-def fetch_annotation(article_url):
+async def fetch_annotation(article_url):
     """
     Получает HTML-страницу по ссылке статьи на ScienceDirect.
     Возвращает текст страницы или "" в случае ошибки.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                      "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Referer": "https://www.sciencedirect.com/"
-    }
     try:
-        response = requests.get(article_url, headers=headers, timeout=10)
+        response = await _http.get(article_url)
         response.raise_for_status()
         return response.text
     except Exception as e:
@@ -106,42 +209,76 @@ def clean_annotation(html_text):
     """
     Ищем аннотацию в разных вариантах контейнеров.
     """
-    soup = BeautifulSoup(html_text, "html.parser")
+    dom = LexborHTMLParser(html_text)
 
-    # Сначала пробуем найти старые варианты
-    abstract_div = soup.find("div", class_="Abstracts")
-    if not abstract_div:
-        abstract_div = soup.find("div", class_="svAbstract")
+    # Сначала пробуем найти старые варианты, затем «новый»
+    abstract_div = None
+    for selector in ABSTRACT_SELECTORS:
+        abstract_div = dom.css_first(selector)
+        if abstract_div is not None:
+            break
 
-    # Если не нашли, пробуем «новый» вариант
-    if not abstract_div:
-        abstract_div = soup.find("div", class_="abstract author")
-
-    if abstract_div:
-        text = abstract_div.get_text(separator=" ", strip=True)
+    if abstract_div is not None:
+        text = abstract_div.text(separator=" ", strip=True)
         # Удаляем всё, что идёт после "Graphical abstract", если есть
         if "Graphical abstract" in text:
             text = text.split("Graphical abstract")[0].strip()
         # Сжимаем повторяющиеся пробелы
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         return text
 
     return "Annotation not found."
 
-def translate_title_openai(eng_title: str) -> str:
+def _is_cyrillic(s: str) -> bool:
+    """
+    Проверяет, что текст уже на русском (больше 30% символов — кириллица).
+    """
+    return sum(1 for c in s if '\u0400' <= c <= '\u04FF') > len(s) * 0.3
+
+def translation_cache_key(model: str, system_prompt: str, text: str) -> str:
+    """
+    Ключ кэша переводов: хэш модели, системного промпта и исходного текста.
+    """
+    return hashlib.md5(f"{model}{system_prompt}{text}".encode(), usedforsecurity=False).hexdigest()
+
+def get_cached_translation(key: str):
+    """
+    Возвращает сохранённый перевод по ключу или None, если его нет.
+    """
+    with _DB_LOCK:
+        row = _CONN.execute(_SQL_TRANSLATION_GET, (key,)).fetchone()
+    return row[0] if row else None
+
+def save_cached_translation(key: str, model: str, output: str):
+    """
+    Сохраняет перевод в кэш.
+    """
+    with _DB_LOCK:
+        _CONN.execute(_SQL_TRANSLATION_PUT, (key, model, output))
+
+async def translate_title_openai(eng_title: str) -> str:
     """
     Переводит заголовок статьи на русский язык через GPT-4 (или gpt-3.5-turbo).
     """
     if not eng_title or eng_title == "No Title":
         return "Нет заголовка"
+    if _is_cyrillic(eng_title):
+        return eng_title
+
+    model = "gpt-4o"  # Или "gpt-3.5-turbo", если нет GPT-4
+    system_prompt = "Ты — профессиональный переводчик. Переведи заголовок статьи на русский язык, сохрани стиль и смысл."
+    key = translation_cache_key(model, system_prompt, eng_title)
+    cached = get_cached_translation(key)
+    if cached is not None:
+        return cached
 
     try:
-        completion = openai.chat.completions.create(
-            model="gpt-4o",  # Или "gpt-3.5-turbo", если нет GPT-4
+        completion = await aclient.chat.completions.create(
+            model=model,
             messages=[
                 {
                     "role": "system",
-                    "content": "Ты — профессиональный переводчик. Переведи заголовок статьи на русский язык, сохрани стиль и смысл."
+                    "content": system_prompt
                 },
                 {
                     "role": "user",
@@ -150,31 +287,42 @@ def translate_title_openai(eng_title: str) -> str:
             ],
             temperature=0
         )
-        return completion.choices[0].message.content.strip()
+        translation = completion.choices[0].message.content.strip()
+        save_cached_translation(key, model, translation)
+        return translation
     except Exception as e:
         print("Ошибка при обращении к OpenAI:", e)
         return eng_title
 
-def translate_annotation_openai(eng_annotation: str) -> str:
+async def translate_annotation_openai(eng_annotation: str) -> str:
     """
     Переводит аннотацию на русский язык.
     Если аннотации нет, возвращает "Аннотация не найдена."
     """
     if not eng_annotation or eng_annotation == "Annotation not found.":
         return "Аннотация не найдена."
+    if _is_cyrillic(eng_annotation):
+        return eng_annotation
+
+    model = "gpt-4o"
+    system_prompt = (
+        "Ты — профессиональный аналитик и переводчик. "
+        "Выбери из текста только текст аннотации и переведи аннотацию на русский язык. "
+        "Раздел Highlights не нужен совсем, не переводи его и не включай в окончательный текст. "
+        "Нужен только текст аннотации, переведенный на русский язык. Не пиши слово Аннотация вначале."
+    )
+    key = translation_cache_key(model, system_prompt, eng_annotation)
+    cached = get_cached_translation(key)
+    if cached is not None:
+        return cached
 
     try:
-        completion = openai.chat.completions.create(
-            model="gpt-4o",
+        completion = await aclient.chat.completions.create(
+            model=model,
             messages=[
                 {
                     "role": "system",
-                    "content": (
-                        "Ты — профессиональный аналитик и переводчик. "
-                        "Выбери из текста только текст аннотации и переведи аннотацию на русский язык. "
-                        "Раздел Highlights не нужен совсем, не переводи его и не включай в окончательный текст. "
-                        "Нужен только текст аннотации, переведенный на русский язык. Не пиши слово Аннотация вначале."
-                    )
+                    "content": system_prompt
                 },
                 {
                     "role": "user",
@@ -183,54 +331,26 @@ def translate_annotation_openai(eng_annotation: str) -> str:
             ],
             temperature=0.3
         )
-        return completion.choices[0].message.content.strip()
+        translation = completion.choices[0].message.content.strip()
+        save_cached_translation(key, model, translation)
+        return translation
     except Exception as e:
         print("Ошибка при обращении к OpenAI:", e)
         return eng_annotation
 
-def save_to_db(article):
-    """
-    Сохраняет статью в базу данных.
-    """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS articles (
-            hash TEXT PRIMARY KEY,
-            title_ru TEXT,
-            annotation_ru TEXT,
-            authors TEXT,
-            published_date TEXT,
-            url TEXT
-        )
-    """)
-    cursor.execute("INSERT OR IGNORE INTO articles VALUES (?, ?, ?, ?, ?, ?)",
-                   (article['hash'], article['title_ru'], article['annotation_ru'],
-                    article['authors'], article['published_date'], article['link']))
-    conn.commit()
-    conn.close()
-
 def is_article_new(article_hash: str) -> bool:
     """
     Проверяет, есть ли статья с данным хэшем в базе.
     Возвращает True, если статья новая, иначе False.
     """
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS articles (
-            hash TEXT PRIMARY KEY,
-            title_ru TEXT,
-            annotation_ru TEXT,
-            authors TEXT,
-            published_date TEXT,
-            url TEXT
-        )
-    """)
-    conn.commit()
-    cursor.execute("SELECT 1 FROM articles WHERE hash=?", (article_hash,))
-    exists = cursor.fetchone() is not None
-    conn.close()
+    if article_hash in _seen_hashes:
+        return False
+
+    with _DB_LOCK:
+        cursor = _CONN.execute(_SQL_EXISTS, (article_hash,))
+        exists = cursor.fetchone()[0]
+    if exists:
+        _seen_hashes.add(article_hash)
     return not exists
 
 def sanitize_for_telegram(text: str) -> str:
@@ -238,108 +358,143 @@ def sanitize_for_telegram(text: str) -> str:
     Удаляем теги <sub>...</sub> и <sup>...</sup>,
     т.к. Telegram в режиме HTML не поддерживает их.
     """
-    text = text.replace("<sub>", "").replace("</sub>", "")
-    text = text.replace("<sup>", "").replace("</sup>", "")
-    return text
+    return _TG_STRIP.sub("", text)
 
 def publish_to_telegram(article):
     """
     Публикует статью в Telegram-канале.
+    Ошибки отправки пробрасываются вызывающему коду.
+    Текстовые поля экранируются: сообщение отправляется в режиме HTML,
+    и символы вроде "<" или "&" (например, "p < 0.05") ломают разбор.
     """
     message = (
-        f"<b>{article['title_ru']}</b>\n"
-        f"Дата публикации: {article['published_date']}\n"
-        f"Автор(ы): {article['authors']}\n\n"
-        f"{article['annotation_ru']}\n\n"
+        f"<b>{html.escape(article['title_ru'], quote=False)}</b>\n"
+        f"Дата публикации: {html.escape(article['published_date'], quote=False)}\n"
+        f"Автор(ы): {html.escape(article['authors'], quote=False)}\n\n"
+        f"{html.escape(article['annotation_ru'], quote=False)}\n\n"
     )
     markup = InlineKeyboardMarkup()
     btn = InlineKeyboardButton(text="Читать далее", url=article['link'])
     markup.add(btn)
 
+    if TELEGRAM_THREAD_ID and TELEGRAM_THREAD_ID.strip():
+        bot.send_message(
+            TELEGRAM_CHANNEL_ID,
+            message,
+            parse_mode="HTML",
+            reply_markup=markup,
+            reply_to_message_id=int(TELEGRAM_THREAD_ID)
+        )
+    else:
+        bot.send_message(
+            TELEGRAM_CHANNEL_ID,
+            message,
+            parse_mode="HTML",
+            reply_markup=markup
+        )
+    logger.info("Сообщение опубликовано в Telegram-канале.")
+
+def save_and_publish(article) -> bool:
+    """
+    Сохраняет статью в БД и публикует её в Telegram в одной транзакции.
+    При временной ошибке (сеть, 5xx, 429) запись откатывается, и статья будет
+    обработана повторно при следующей проверке RSS.
+    Если Telegram отклонил само сообщение (400 "can't parse entities" или
+    "message is too long"), повтор ничего не даст: запись сохраняется,
+    и статья больше не публикуется. Прочие ошибки 400 (например, "chat not found")
+    связаны с настройками канала, поэтому запись откатывается.
+    Возвращает True, если статья опубликована.
+    """
+    published = False
     try:
-        if TELEGRAM_THREAD_ID and TELEGRAM_THREAD_ID.strip():
-            bot.send_message(
-                TELEGRAM_CHANNEL_ID,
-                message,
-                parse_mode="HTML",
-                reply_markup=markup,
-                reply_to_message_id=int(TELEGRAM_THREAD_ID)
-            )
-        else:
-            bot.send_message(
-                TELEGRAM_CHANNEL_ID,
-                message,
-                parse_mode="HTML",
-                reply_markup=markup
-            )
-        logger.info("Сообщение опубликовано в Telegram-канале.")
+        with _DB_LOCK, _CONN:
+            _CONN.execute("BEGIN")
+            _CONN.execute(_SQL_INSERT,
+                          (article['hash'], article['title_ru'], article['annotation_ru'],
+                           article['authors'], article['published_date'], article['link']))
+            try:
+                publish_to_telegram(article)
+                published = True
+            except apihelper.ApiTelegramException as e:
+                description = (e.description or "").lower()
+                if e.error_code != 400 or not any(err in description for err in _TG_PERMANENT_ERRORS):
+                    raise
+                logger.error(
+                    f"Telegram отклонил статью, она сохранена в БД без публикации: "
+                    f"hash={article['hash']}, url={article['link']}, "
+                    f"title={article['title_ru']!r}, ошибка: {e.description}"
+                )
+    except sqlite3.Error as e:
+        logger.error(f"Ошибка записи статьи в БД: {e}")
+        return False
     except Exception as e:
         logger.error(f"Ошибка публикации в Telegram-канале: {e}")
+        return False
+    _seen_hashes.add(article['hash'])
+    return published
 
-def main():
+async def fetch_and_translate_annotation(article_url):
+    """
+    Скачивает страницу статьи, ищет аннотацию и переводит её.
+    """
+    page_html = await fetch_annotation(article_url)
+    raw_annotation = clean_annotation(page_html)
+    return await translate_annotation_openai(raw_annotation)
+
+async def process_article(article):
+    """
+    Переводит заголовок и аннотацию статьи (запросы выполняются параллельно).
+    """
+    article['title_ru'], article['annotation_ru'] = await asyncio.gather(
+        translate_title_openai(article['title']),
+        fetch_and_translate_annotation(article['link'])
+    )
+
+    # Удаляем <sub>/<sup> из заголовка и аннотации перед сохранением в БД
+    article['title_ru'] = sanitize_for_telegram(article['title_ru'])
+    article['annotation_ru'] = sanitize_for_telegram(article['annotation_ru'])
+
+async def main():
     """
     1. Парсинг RSS
     2. Проверка и перевод новых статей
     3. Сохранение в БД
     4. Публикация в Telegram
     """
-    articles = parse_rss()
+    articles = await parse_rss()
+    new_articles = []
     for article in articles:
         # Генерация уникального хэша
-        article['hash'] = hashlib.md5(f"{article['title']}{article['link']}".encode()).hexdigest()
+        article['hash'] = hashlib.md5(f"{article['title']}{article['link']}".encode(), usedforsecurity=False).hexdigest()
 
         # Если уже есть, пропускаем
         if not is_article_new(article['hash']):
             logger.info(f"Статья с хэшем {article['hash']} уже существует. Пропускаем публикацию.")
             continue
+        new_articles.append(article)
 
-        # Перевод заголовка
-        article['title_ru'] = translate_title_openai(article['title'])
-
-        # Скачиваем страницу, ищем аннотацию, переводим
-        page_html = fetch_annotation(article['link'])
-        raw_annotation = clean_annotation(page_html)
-        article['annotation_ru'] = translate_annotation_openai(raw_annotation)
-
-        # Удаляем <sub>/<sup> из заголовка и аннотации перед сохранением в БД
-        article['title_ru'] = sanitize_for_telegram(article['title_ru'])
-        article['annotation_ru'] = sanitize_for_telegram(article['annotation_ru'])
+    # Переводим все новые статьи параллельно
+    await asyncio.gather(*[process_article(article) for article in new_articles])
 
-        # Сохранение в БД
-        save_to_db(article)
-
-        # Публикуем в Telegram
-        publish_to_telegram(article)
-        logger.info(f"Обработана новая статья: {article['title_ru']}")
+    # Сохраняем и публикуем в порядке RSS-ленты.
+    # Отправка в Telegram блокирующая и идёт внутри транзакции, поэтому
+    # выполняется в отдельном потоке, чтобы не останавливать цикл событий
+    for article in new_articles:
+        if await asyncio.to_thread(save_and_publish, article):
+            logger.info(f"Обработана новая статья: {article['title_ru']}")
 
 def export_db_to_csv():
     """
     Выгружает всю таблицу articles в CSV.
     """
     filename = "ijohe_pub.csv"
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS articles (
-            hash TEXT PRIMARY KEY,
-            title_ru TEXT,
-            annotation_ru TEXT,
-            authors TEXT,
-            published_date TEXT,
-            url TEXT
-        )
-    """)
-    conn.commit()
-
-    cursor.execute("SELECT hash, title_ru, annotation_ru, authors, published_date, url FROM articles")
-    rows = cursor.fetchall()
-    conn.close()
-
     with open(filename, "w", newline="", encoding="utf-8-sig") as f:
         writer = csv.writer(f)
         writer.writerow(["Hash", "Russian Title", "Russian Annotation", "Authors", "Publication Date", "URL"])
-        for row in rows:
-            writer.writerow(row)
+        # Строки пишутся прямо из курсора, без загрузки всей таблицы в память
+        with _DB_LOCK:
+            cursor = _CONN.execute("SELECT hash, title_ru, annotation_ru, authors, published_date, url FROM articles")
+            writer.writerows(cursor)
     return filename
 
 def send_csv_to_telegram():
@@ -358,13 +513,40 @@ def send_csv_to_telegram():
         logger.error("Ошибка при отправке CSV-файла: " + str(e))
 
 # Планировщик заданий
-# 1) Проверяем RSS каждую минуту
-schedule.every(1).minutes.do(main)
-# 2) Отправляем CSV по субботам в 02:50 (пример)
+# Отправляем CSV по субботам в 17:00 (пример)
 schedule.every().saturday.at("17:00").do(send_csv_to_telegram)
 
+async def poll_rss():
+    """
+    Проверяем RSS каждую минуту.
+    """
+    while True:
+        await main()
+        await asyncio.sleep(60)
+
+async def run_schedule():
+    """
+    Выполняет задания планировщика schedule.
+    Спит до ближайшего задания (но не дольше минуты), а не просыпается каждую секунду.
+    Задания (выгрузка и отправка CSV) блокирующие, поэтому выполняются
+    в отдельном потоке и не останавливают проверку RSS.
+    """
+    while True:
+        await asyncio.to_thread(schedule.run_pending)
+        idle = schedule.idle_seconds()
+        if idle is None:
+            idle = 60
+        await asyncio.sleep(min(max(idle, 0), 60))
+
+async def run_bot():
+    """
+    Запускает проверку RSS и планировщик в одном цикле событий.
+    """
+    try:
+        await asyncio.gather(poll_rss(), run_schedule())
+    finally:
+        await _http.aclose()
+
 if __name__ == "__main__":
     logger.info("Бот запущен. Ожидание задач...")
-    while True:
-        schedule.run_pending()
-        time.sleep(1)
+    asyncio.run(run_bot())